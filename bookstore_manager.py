@@ -1,25 +1,260 @@
+import atexit
+import datetime
+import itertools
+import re
 import sqlite3
+import sys
 from typing import Optional
 
+DB_PATH = "bookstore.db"
+
+# 書店資料庫必須具備的資料表
+REQUIRED_TABLES = ("member", "book", "sale")
+
+# 連線的預備陳述式快取容量；常用 SQL 皆定義為下列模組常數，
+# 每次執行相同文字即可命中快取，省去重新解析的成本
+CACHED_STATEMENTS = 256
+
+# 可重複執行的附加結構（觸發器與 JOIN 用索引），須在插入初始資料之後建立，
+# 以免初始銷售資料觸發庫存扣除
+SQL_SCHEMA_EXTRAS = """
+    CREATE TRIGGER IF NOT EXISTS sale_decrement_stock
+    AFTER INSERT ON sale
+    FOR EACH ROW
+    BEGIN
+        UPDATE book SET bstock = bstock - NEW.sqty WHERE bid = NEW.bid;
+    END;
+
+    CREATE INDEX IF NOT EXISTS idx_sale_mid ON sale(mid);
+    CREATE INDEX IF NOT EXISTS idx_sale_bid ON sale(bid);
+"""
+
+# 一次查詢會員是否存在及書籍庫存與單價；書籍不存在時後兩欄為 NULL
+SQL_SALE_LOOKUP = """
+    SELECT
+        EXISTS (SELECT 1 FROM member WHERE mid = ?),
+        book.bstock, book.bprice
+    FROM (SELECT 1)
+    LEFT JOIN book ON book.bid = ?
+"""
+SQL_INSERT_SALE = """
+    INSERT INTO sale
+        (sdate, mid, bid, sqty, sdiscount, stotal)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# 報表只讀取 sale，會員名稱與書籍資訊改由記憶體快取對應
+SQL_REPORT = """
+    SELECT sid, sdate, mid, bid, sqty, sdiscount, stotal
+    FROM sale
+    ORDER BY sid;
+"""
+SQL_MEMBER_NAMES = "SELECT mid, mname FROM member"
+SQL_BOOK_INFO = "SELECT bid, btitle, bprice FROM book"
+SQL_LIST_SALES = """
+    SELECT sale.sid, sale.sdate, member.mname
+    FROM sale
+    JOIN member ON sale.mid = member.mid
+    ORDER BY sale.sid
+    LIMIT ? OFFSET ?;
+"""
+SQL_SALE_DISCOUNT = """
+    SELECT sdiscount FROM sale
+    JOIN book ON sale.bid = book.bid
+    WHERE sale.sid = ?;
+"""
+# 在資料庫內以書籍單價重新計算銷售總額，並直接回傳新的總額
+SQL_UPDATE_SALE = """
+    UPDATE sale
+    SET sdiscount = :discount,
+        stotal = (SELECT bprice FROM book WHERE book.bid = sale.bid) * sqty
+            - :discount
+    WHERE sid = :sid
+    RETURNING stotal;
+"""
+SQL_DELETE_SALE = "DELETE FROM sale WHERE sid = ?"
+
+# 更新與刪除時，銷售記錄列表每頁顯示的筆數
+PAGE_SIZE = 20
+
+# 銷售日期格式 YYYY-MM-DD
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+
+# 主選單內容
+MENU_TEXT = (
+    "***************選單***************\n"
+    "1. 新增銷售記錄\n"
+    "2. 顯示銷售報表\n"
+    "3. 更新銷售記錄\n"
+    "4. 刪除銷售記錄\n"
+    "5. 離開\n"
+    "**********************************\n"
+)
+
+# 銷售報表的標題與分隔線
+REPORT_HEADER = "==================== 銷售報表 ===================="
+REPORT_RULE = "-" * 50
+REPORT_SEPARATOR = "=" * 50
+
+# 銷售記錄列表的標題與結尾
+SALES_LIST_HEADER = "======== 銷售記錄列表 ========"
+SALES_LIST_FOOTER = "=" * 32
+
+# 程式執行期間共用的資料庫連線，由 get_conn() 延遲建立
+_CONN: Optional[sqlite3.Connection] = None
+
+# 會員與書籍資料甚少變動，於首次使用時載入；修改這兩個資料表後
+# 須呼叫 invalidate_lookup_caches()
+_MEMBER_CACHE: dict[str, str] = {}
+_BOOK_CACHE: dict[str, tuple[str, int]] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    開啟書店資料庫連線，並套用 WAL 日誌模式等效能相關設定。
+
+    回傳:
+        sqlite3.Connection: 已設定完成的 SQLite 資料庫連線物件。
+    """
+    conn = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS)
+    # WAL 模式會寫入資料庫檔案並持續生效；其餘設定僅作用於此連線
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    return conn
+
+
+def get_conn() -> sqlite3.Connection:
+    """
+    取得共用的資料庫連線；首次呼叫時建立連線，並於程式結束時自動關閉。
+
+    回傳:
+        sqlite3.Connection: 共用的 SQLite 資料庫連線物件。
+    """
+    global _CONN
+    if _CONN is None:
+        _CONN = _connect()
+        atexit.register(_close_conn)
+    return _CONN
+
+
+def _close_conn() -> None:
+    """
+    關閉共用的資料庫連線；關閉前執行 PRAGMA optimize 以更新查詢規劃統計資料。
+
+    回傳:
+        None
+    """
+    global _CONN
+    if _CONN is not None:
+        _CONN.execute("PRAGMA optimize")
+        _CONN.close()
+        _CONN = None
+
+
+def load_lookup_caches(conn: sqlite3.Connection) -> None:
+    """
+    若快取為空，從資料庫載入會員名稱與書籍資訊。
+
+    參數:
+        conn (sqlite3.Connection): SQLite 資料庫連線物件。
+
+    回傳:
+        None
+    """
+    if not _MEMBER_CACHE:
+        _MEMBER_CACHE.update(conn.execute(SQL_MEMBER_NAMES))
+    if not _BOOK_CACHE:
+        for bid, title, price in conn.execute(SQL_BOOK_INFO):
+            _BOOK_CACHE[bid] = (title, price)
+
+
+def invalidate_lookup_caches() -> None:
+    """
+    清除會員與書籍快取，下次使用時重新載入。
+
+    回傳:
+        None
+    """
+    _MEMBER_CACHE.clear()
+    _BOOK_CACHE.clear()
+
 
-def table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
+def tables_exist(conn: sqlite3.Connection, table_names: tuple[str, ...]) -> bool:
     """
-    檢查指定的資料表是否存在於 SQLite 資料庫中。
+    以單一查詢檢查指定的資料表是否全部存在於 SQLite 資料庫中。
 
     參數:
         conn (sqlite3.Connection): SQLite 資料庫連線物件。
-        table_name (str): 要檢查的資料表名稱。
+        table_names (tuple[str, ...]): 要檢查的資料表名稱。
 
     回傳:
-        bool: 若資料表存在則回傳 True，否則回傳 False。
+        bool: 若資料表全部存在則回傳 True，否則回傳 False。
     """
-    cursor = conn.cursor()
-    cursor.execute(
+    placeholders = ", ".join("?" * len(table_names))
+    cursor = conn.execute(
         "SELECT name FROM sqlite_master "
-        "WHERE type='table' AND name=?;",
-        (table_name,),
+        f"WHERE type='table' AND name IN ({placeholders});",
+        table_names,
+    )
+    return len(cursor.fetchall()) == len(table_names)
+
+
+def parse_int(text: str) -> Optional[int]:
+    """
+    將使用者輸入轉換為整數；先檢查字元組成，避免在一般的輸入錯誤上拋出例外。
+
+    參數:
+        text (str): 使用者輸入的文字。
+
+    回傳:
+        Optional[int]: 轉換後的整數；若不是有效的整數則回傳 None。
+    """
+    text = text.strip()
+    digits = text[1:] if text.startswith("-") else text
+    if not digits.isdecimal():
+        return None
+    return int(text)
+
+
+def is_valid_date(text: str) -> bool:
+    """
+    檢查文字是否為 YYYY-MM-DD 格式且存在的日期。
+
+    參數:
+        text (str): 使用者輸入的日期文字。
+
+    回傳:
+        bool: 若為有效日期則回傳 True，否則回傳 False。
+    """
+    if not DATE_PATTERN.fullmatch(text):
+        return False
+    try:
+        datetime.date.fromisoformat(text)
+    except ValueError:  # 月份或日期超出範圍
+        return False
+    return True
+
+
+def insert_rows(
+    conn: sqlite3.Connection, target: str, rows: list[tuple]
+) -> None:
+    """
+    以單一多列 INSERT ... VALUES (...), (...) 陳述式寫入多筆資料。
+
+    參數:
+        conn (sqlite3.Connection): SQLite 資料庫連線物件。
+        target (str): 資料表名稱，可附帶欄位清單，例如 "sale (sdate, mid)"。
+        rows (list[tuple]): 要寫入的資料列，每列欄位數需相同。
+
+    回傳:
+        None
+    """
+    row_placeholders = "(" + ", ".join("?" * len(rows[0])) + ")"
+    conn.execute(
+        f"INSERT INTO {target} VALUES " + ", ".join([row_placeholders] * len(rows)),
+        [value for row in rows for value in row],
     )
-    return cursor.fetchone() is not None
 
 
 def init_db() -> None:
@@ -29,44 +264,44 @@ def init_db() -> None:
     回傳:
         None
     """
-    with sqlite3.connect("bookstore.db") as conn:
-        if not (
-            table_exists(conn, "member")
-            and table_exists(conn, "book")
-            and table_exists(conn, "sale")
-        ):
-            print("資料表不存在，正在建立資料表並插入初始資料...")
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS member (
-                    mid TEXT PRIMARY KEY,
-                    mname TEXT NOT NULL,
-                    mphone TEXT NOT NULL,
-                    memail TEXT
-                );
-
-                CREATE TABLE IF NOT EXISTS book (
-                    bid TEXT PRIMARY KEY,
-                    btitle TEXT NOT NULL,
-                    bprice INTEGER NOT NULL,
-                    bstock INTEGER NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS sale (
-                    sid INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sdate TEXT NOT NULL,
-                    mid TEXT NOT NULL,
-                    bid TEXT NOT NULL,
-                    sqty INTEGER NOT NULL,
-                    sdiscount INTEGER NOT NULL,
-                    stotal INTEGER NOT NULL
-                );
-                """
-            )
+    conn = get_conn()
+    created = not tables_exist(conn, REQUIRED_TABLES)
+    if created:
+        print("資料表不存在，正在建立資料表並插入初始資料...")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS member (
+                mid TEXT PRIMARY KEY,
+                mname TEXT NOT NULL,
+                mphone TEXT NOT NULL,
+                memail TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS book (
+                bid TEXT PRIMARY KEY,
+                btitle TEXT NOT NULL,
+                bprice INTEGER NOT NULL,
+                bstock INTEGER NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS sale (
+                sid INTEGER PRIMARY KEY AUTOINCREMENT,
+                sdate TEXT NOT NULL,
+                mid TEXT NOT NULL,
+                bid TEXT NOT NULL,
+                sqty INTEGER NOT NULL,
+                sdiscount INTEGER NOT NULL,
+                stotal INTEGER NOT NULL
+            );
+            """
+        )
+        # 以單一交易寫入全部初始資料，只需提交一次
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
             # 插入初始會員資料
-            cursor = conn.cursor()
-            cursor.executemany(
-                "INSERT INTO member VALUES (?, ?, ?, ?)",
+            insert_rows(
+                conn,
+                "member",
                 [
                     ("M001", "Alice", "0912-345678", "alice@example.com"),
                     ("M002", "Bob", "0923-456789", "bob@example.com"),
@@ -74,8 +309,9 @@ def init_db() -> None:
                 ],
             )
             # 插入初始書籍資料
-            cursor.executemany(
-                "INSERT INTO book VALUES (?, ?, ?, ?)",
+            insert_rows(
+                conn,
+                "book",
                 [
                     ("B001", "Python Programming", 600, 50),
                     ("B002", "Data Science Basics", 800, 30),
@@ -83,11 +319,9 @@ def init_db() -> None:
                 ],
             )
             # 插入初始銷售資料
-            cursor.executemany(
-                (
-                    "INSERT INTO sale (sdate, mid, bid, sqty, sdiscount, stotal) "
-                    "VALUES (?, ?, ?, ?, ?, ?)"
-                ),
+            insert_rows(
+                conn,
+                "sale (sdate, mid, bid, sqty, sdiscount, stotal)",
                 [
                     ("2024-01-15", "M001", "B001", 2, 100, 1100),
                     ("2024-01-16", "M002", "B002", 1, 50, 750),
@@ -95,10 +329,14 @@ def init_db() -> None:
                     ("2024-01-18", "M003", "B001", 1, 0, 600),
                 ],
             )
-            conn.commit()
-            print("資料表建立並初始化完成！")
-        else:
-            print("資料庫已經存在資料表，不需要重新建立。")
+        invalidate_lookup_caches()
+        print("資料表建立並初始化完成！")
+    else:
+        print("資料庫已經存在資料表，不需要重新建立。")
+    conn.executescript(SQL_SCHEMA_EXTRAS)
+    if created:
+        # 建立索引並寫入初始資料後收集統計資料，讓查詢規劃器依成本選擇索引
+        conn.execute("ANALYZE")
 
 
 def select_menu() -> None:
@@ -108,16 +346,7 @@ def select_menu() -> None:
     回傳:
         None
     """
-    menu = (
-        "***************選單***************",
-        "1. 新增銷售記錄",
-        "2. 顯示銷售報表",
-        "3. 更新銷售記錄",
-        "4. 刪除銷售記錄",
-        "5. 離開",
-        "**********************************",
-    )
-    print("\n".join(menu))
+    sys.stdout.write(MENU_TEXT)
 
 
 def sales_record() -> None:
@@ -127,65 +356,51 @@ def sales_record() -> None:
     回傳:
         None
     """
-    with sqlite3.connect("bookstore.db") as conn:
-        cursor = conn.cursor()
-
-        while True:
-            sales_date = input("請輸入銷售日期 (YYYY-MM-DD)：")
-            if len(sales_date) != 10 or sales_date.count("-") != 2:
-                print("錯誤：請輸入正確的日期格式 (YYYY-MM-DD)")
-                continue
-
-            member_id = input("請輸入會員編號：")
-            book_id = input("請輸入書籍編號：")
-
-            cursor.execute("SELECT 1 FROM member WHERE mid = ?", (member_id,))
-            if cursor.fetchone() is None:
-                print("錯誤：會員編號無效")
-                continue
-
-            cursor.execute("SELECT bstock, bprice FROM book WHERE bid = ?", (book_id,))
-            book_data = cursor.fetchone()
-            if book_data is None:
-                print("錯誤：書籍編號無效")
-                continue
+    conn = get_conn()
 
-            stock, price = book_data
-            try:
-                qty = int(input("請輸入購買數量："))
-                if qty <= 0:
-                    raise ValueError
-            except ValueError:
-                print("錯誤：數量必須為正整數，請重新輸入")
-                continue
-
-            try:
-                discount = int(input("請輸入折扣金額："))
-                if discount < 0:
-                    raise ValueError
-            except ValueError:
-                print("錯誤：折扣金額必須為非負整數，請重新輸入")
-                continue
-
-            if qty > stock:
-                print(f"錯誤：書籍庫存不足 (現有庫存: {stock})")
-                continue
-
-            total = price * qty - discount
-            cursor.execute(
-                """
-                INSERT INTO sale
-                    (sdate, mid, bid, sqty, sdiscount, stotal)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+    while True:
+        sales_date = input("請輸入銷售日期 (YYYY-MM-DD)：")
+        if not is_valid_date(sales_date):
+            print("錯誤：請輸入正確的日期格式 (YYYY-MM-DD)")
+            continue
+
+        member_id = input("請輸入會員編號：")
+        book_id = input("請輸入書籍編號：")
+
+        member_ok, stock, price = conn.execute(
+            SQL_SALE_LOOKUP, (member_id, book_id)
+        ).fetchone()
+        if not member_ok:
+            print("錯誤：會員編號無效")
+            continue
+
+        if stock is None:
+            print("錯誤：書籍編號無效")
+            continue
+
+        qty = parse_int(input("請輸入購買數量："))
+        if qty is None or qty <= 0:
+            print("錯誤：數量必須為正整數，請重新輸入")
+            continue
+
+        discount = parse_int(input("請輸入折扣金額："))
+        if discount is None or discount < 0:
+            print("錯誤：折扣金額必須為非負整數，請重新輸入")
+            continue
+
+        if qty > stock:
+            print(f"錯誤：書籍庫存不足 (現有庫存: {stock})")
+            continue
+
+        total = price * qty - discount
+        with conn:
+            # 書籍庫存由 sale_decrement_stock 觸發器在資料庫內扣除
+            conn.execute(
+                SQL_INSERT_SALE,
                 (sales_date, member_id, book_id, qty, discount, total),
             )
-            cursor.execute(
-                "UPDATE book SET bstock = bstock - ? WHERE bid = ?", (qty, book_id)
-            )
-            conn.commit()
-            print(f"=> 銷售記錄已新增！(銷售總額: {total})")
-            break
+        print(f"=> 銷售記錄已新增！(銷售總額: {total})")
+        break
 
 
 def show_sales_report() -> None:
@@ -195,37 +410,59 @@ def show_sales_report() -> None:
     回傳:
         None
     """
-    with sqlite3.connect("bookstore.db") as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT
-                sale.sid, sale.sdate, member.mname, book.btitle,
-                book.bprice, sale.sqty, sale.sdiscount, sale.stotal
-            FROM sale
-            JOIN member ON sale.mid = member.mid
-            JOIN book ON sale.bid = book.bid
-            ORDER BY sale.sid;
-            """
+    conn = get_conn()
+    load_lookup_caches(conn)
+    # 逐列讀取游標，不將整份報表載入記憶體；
+    # 與原本的 JOIN 相同，略過找不到會員或書籍的記錄
+    rows = (
+        (sid, sdate, _MEMBER_CACHE[mid], *_BOOK_CACHE[bid], qty, disc, total)
+        for sid, sdate, mid, bid, qty, disc, total in conn.execute(SQL_REPORT)
+        if mid in _MEMBER_CACHE and bid in _BOOK_CACHE
+    )
+    first = next(rows, None)
+
+    if first is None:
+        print("目前沒有銷售紀錄。")
+        return
+
+    print(REPORT_HEADER)
+    for sid, sdate, mname, title, price, qty, disc, total in itertools.chain(
+        [first], rows
+    ):
+        # 每筆記錄組成一段文字後一次寫出，減少 print 呼叫次數
+        sys.stdout.write(
+            f"銷售 #{sid}\n"
+            f"日期: {sdate} 會員: {mname} 書籍: {title}\n"
+            f"{REPORT_RULE}\n"
+            "單價\t數量\t折扣\t小計\n"
+            f"{REPORT_RULE}\n"
+            f"{price:,}\t{qty}\t{disc:,}\t{total:,}\n"
+            f"{REPORT_RULE}\n"
+            f"銷售總額: {total:,}\n"
+            f"{REPORT_SEPARATOR}\n"
         )
-        rows = cursor.fetchall()
 
-        if not rows:
-            print("目前沒有銷售紀錄。")
-            return
 
-        print("==================== 銷售報表 ====================")
-        for sid, sdate, mname, title, price, qty, disc, total in rows:
-            print(f"銷售 #{sid}")
-            print(f"日期: {sdate} 會員: {mname} 書籍: {title}")
-            print("-" * 50)
-            print("單價\t數量\t折扣\t小計")
-            print("-" * 50)
-            subtotal = price * qty - disc
-            print(f"{price:,}\t{qty}\t{disc:,}\t{subtotal:,}")
-            print("-" * 50)
-            print(f"銷售總額: {total:,}")
-            print("=" * 50)
+def _list_sales(conn: sqlite3.Connection, offset: int) -> list[tuple]:
+    """
+    讀取並顯示一頁銷售記錄列表，供更新與刪除操作選擇。
+
+    參數:
+        conn (sqlite3.Connection): SQLite 資料庫連線物件。
+        offset (int): 此頁第一筆記錄在全部記錄中的位移。
+
+    回傳:
+        list[tuple]: 此頁的 (銷售編號, 日期, 會員名稱)；超出範圍時為空串列。
+    """
+    sales = conn.execute(SQL_LIST_SALES, (PAGE_SIZE, offset)).fetchall()
+
+    if sales:
+        print(SALES_LIST_HEADER)
+        for i, sale in enumerate(sales, offset + 1):
+            sid, sdate, mname = sale
+            print(f"{i}. 銷售編號: {sid} - 會員: {mname} - 日期: {sdate}")
+        print(SALES_LIST_FOOTER)
+    return sales
 
 
 def update_sales_record() -> None:
@@ -235,87 +472,77 @@ def update_sales_record() -> None:
     回傳:
         None
     """
-    with sqlite3.connect("bookstore.db") as conn:
-        cursor = conn.cursor()
+    conn = get_conn()
 
-        # 顯示銷售記錄列表
-        cursor.execute("""
-            SELECT sale.sid, sale.sdate, member.mname
-            FROM sale
-            JOIN member ON sale.mid = member.mid
-            ORDER BY sale.sid;
-        """)
+    # 顯示銷售記錄列表的第一頁，只讀取目前頁面的資料
+    offset = 0
+    sales = _list_sales(conn, offset)
 
-        sales = cursor.fetchall()
+    if not sales:
+        print("目前沒有銷售記錄。")
+        return
 
-        if not sales:
-            print("目前沒有銷售記錄。")
+    # 讓使用者選擇銷售編號
+    while True:
+        choice = input(
+            "請選擇要更新的銷售編號 (輸入數字，n/p 換頁，或按 Enter 取消): "
+        )
+        if choice == "":
+            print("取消更新操作。")
             return
 
-        print("======== 銷售記錄列表 ========")
-        for i, sale in enumerate(sales, 1):
-            sid, sdate, mname = sale
-            print(f"{i}. 銷售編號: {sid} - 會員: {mname} - 日期: {sdate}")
-        print("================================")
-
-        # 讓使用者選擇銷售編號
-        while True:
-            choice = input("請選擇要更新的銷售編號 (輸入數字或按 Enter 取消): ")
-            if choice == "":
-                print("取消更新操作。")
-                conn.close()
-                return
-
-            try:
-                sale_index = int(choice) - 1  # 將選擇的編號轉為索引
-                if sale_index < 0 or sale_index >= len(sales):  # 檢查選擇的編號是否有效
-                    print("錯誤：無效的選擇！請選擇有效的銷售編號")
-                    continue
-                sid = sales[sale_index][0]  # 獲取選中的銷售編號
-                break
-
-            except ValueError:
-                print("錯誤：請選擇有效的數字或按 Enter 取消")  # 捕獲無效數字錯誤
-
-        # 取得當前銷售記錄的詳細資料（包括折扣和小計）
-        cursor.execute("""
-            SELECT bprice, sqty, sdiscount FROM sale
-            JOIN book ON sale.bid = book.bid
-            WHERE sale.sid = ?;
-        """, (sid,))
-        book_data = cursor.fetchone()
-
-        if not book_data:
-            print("錯誤：找不到該銷售記錄的書籍資料！")
-            conn.close()
-            return
+        if choice in ("n", "p"):
+            new_offset = offset + PAGE_SIZE if choice == "n" else offset - PAGE_SIZE
+            if new_offset < 0:
+                print("已經是第一頁")
+                continue
+            page = _list_sales(conn, new_offset)
+            if not page:
+                print("已經是最後一頁")
+                continue
+            offset, sales = new_offset, page
+            continue
+
+        number = parse_int(choice)
+        if number is None:
+            print("錯誤：請選擇有效的數字或按 Enter 取消")
+            continue
 
-        bprice, sqty, old_discount = book_data
+        sale_index = number - 1 - offset  # 將選擇的編號轉為目前頁面的索引
+        if sale_index < 0 or sale_index >= len(sales):  # 檢查選擇的編號是否有效
+            print("錯誤：無效的選擇！請選擇有效的銷售編號")
+            continue
+        sid = sales[sale_index][0]  # 獲取選中的銷售編號
+        break
 
-        # 顯示當前折扣並讓使用者輸入新的折扣
-        print(f"目前的折扣金額是: {old_discount}")
-        while True:
-            try:
-                new_discount = int(input("請輸入新的折扣金額："))
-                if new_discount < 0:
-                    print("錯誤：折扣金額不能為負數，請重新輸入")
-                    continue  # 如果折扣為負數，繼續要求輸入
-                break  # 如果折扣金額有效，退出循環
-            except ValueError:
-                print("錯誤：請輸入有效的折扣金額")
+    # 取得當前銷售記錄的折扣，並確認其書籍資料存在
+    sale_data = conn.execute(SQL_SALE_DISCOUNT, (sid,)).fetchone()
 
-        # 計算新的銷售總額
-        new_stotal = bprice * sqty - new_discount
+    if not sale_data:
+        print("錯誤：找不到該銷售記錄的書籍資料！")
+        return
 
-        # 更新資料庫中的折扣金額和銷售總額
-        cursor.execute("""
-            UPDATE sale
-            SET sdiscount = ?, stotal = ?
-            WHERE sid = ?;
-        """, (new_discount, new_stotal, sid))
-        conn.commit()
+    (old_discount,) = sale_data
+
+    # 顯示當前折扣並讓使用者輸入新的折扣
+    print(f"目前的折扣金額是: {old_discount}")
+    while True:
+        new_discount = parse_int(input("請輸入新的折扣金額："))
+        if new_discount is None:
+            print("錯誤：請輸入有效的折扣金額")
+            continue
+        if new_discount < 0:
+            print("錯誤：折扣金額不能為負數，請重新輸入")
+            continue  # 如果折扣為負數，繼續要求輸入
+        break  # 如果折扣金額有效，退出循環
 
-        print(f"=> 銷售編號 {sid} 已更新！(銷售總額: {new_stotal:,})")
+    # 更新資料庫中的折扣金額，並由資料庫計算新的銷售總額
+    with conn:
+        (new_stotal,) = conn.execute(
+            SQL_UPDATE_SALE, {"discount": new_discount, "sid": sid}
+        ).fetchone()
+
+    print(f"=> 銷售編號 {sid} 已更新！(銷售總額: {new_stotal:,})")
 
 
 def delete_sales_record() -> None:
@@ -325,56 +552,57 @@ def delete_sales_record() -> None:
     回傳:
         None
     """
-    with sqlite3.connect("bookstore.db") as conn:
-        cursor = conn.cursor()
-
-        # 顯示銷售記錄列表
-        cursor.execute("""
-            SELECT sale.sid, sale.sdate, member.mname
-            FROM sale
-            JOIN member ON sale.mid = member.mid
-            ORDER BY sale.sid;
-        """)
+    conn = get_conn()
 
-        sales = cursor.fetchall()
+    # 顯示銷售記錄列表的第一頁，只讀取目前頁面的資料
+    offset = 0
+    sales = _list_sales(conn, offset)
 
-        if not sales:
-            print("目前沒有銷售記錄。")
-            return
+    if not sales:
+        print("目前沒有銷售記錄。")
+        return
 
-        print("======== 銷售記錄列表 ========")
-        for i, sale in enumerate(sales, 1):
-            sid, sdate, mname = sale
-            print(f"{i}. 銷售編號: {sid} - 會員: {mname} - 日期: {sdate}")
-        print("================================")
+    # 讓使用者選擇銷售編號
+    while True:
+        choice = input(
+            "請選擇要刪除的銷售編號 (輸入數字，n/p 換頁，或按 Enter 取消): "
+        )
 
-        # 讓使用者選擇銷售編號
-        while True:
-            choice = input("請選擇要刪除的銷售編號 (輸入數字或按 Enter 取消): ")
+        if choice == "":
+            print("取消刪除操作。")
+            return
 
-            if choice == "":
-                print("取消刪除操作。")
-                conn.close()
-                return
+        if choice in ("n", "p"):
+            new_offset = offset + PAGE_SIZE if choice == "n" else offset - PAGE_SIZE
+            if new_offset < 0:
+                print("已經是第一頁")
+                continue
+            page = _list_sales(conn, new_offset)
+            if not page:
+                print("已經是最後一頁")
+                continue
+            offset, sales = new_offset, page
+            continue
 
-            try:
-                choice = int(choice)
-                if choice < 1 or choice > len(sales):
-                    print("錯誤：請輸入有效的數字")
-                    continue
+        number = parse_int(choice)
+        if number is None:
+            print("錯誤：請輸入有效的數字")
+            continue
 
-                # 確定要刪除的銷售編號
-                sid_to_delete = sales[choice - 1][0]
+        number -= offset
+        if number < 1 or number > len(sales):
+            print("錯誤：請輸入有效的數字")
+            continue
 
-                # 刪除該銷售記錄
-                cursor.execute("DELETE FROM sale WHERE sid = ?", (sid_to_delete,))
-                conn.commit()
+        # 確定要刪除的銷售編號
+        sid_to_delete = sales[number - 1][0]
 
-                print(f"=> 銷售編號 {sid_to_delete} 已刪除")
-                break
+        # 刪除該銷售記錄
+        with conn:
+            conn.execute(SQL_DELETE_SALE, (sid_to_delete,))
 
-            except ValueError:
-                print("錯誤：請輸入有效的數字")
+        print(f"=> 銷售編號 {sid_to_delete} 已刪除")
+        break
 
 
 def main() -> None: